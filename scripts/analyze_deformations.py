@@ -1,4 +1,5 @@
 from ovito.io import import_file
+from ovito.modifiers import CalculateDisplacementsModifier
 import numpy as np
 
 def analyze_deformation(filename):
@@ -13,39 +14,39 @@ def analyze_deformation(filename):
             print("Error: No frames found in the simulation file.")
             return
 
-        # Get initial positions from the first frame (index 0)
-        print("Reading initial positions from timestep 0...")
+        # Let OVITO compute per-particle displacements relative to frame 0 on the C++ side
+        pipeline.modifiers.append(CalculateDisplacementsModifier(reference_frame=0))
+
+        # Evaluate the reference frame (index 0) once for its timestep
+        print("Reading reference frame from timestep 0...")
         data_initial = pipeline.compute(0)
-        initial_positions = data_initial.particles.positions
 
         print(f"Analyzing deformation (displacement) from {filename}...")
         print("------------------------------------------")
         print("Timestep | Average Displacement Magnitude")
         print("------------------------------------------")
 
-        # Loop through all timesteps starting from the first frame (index 0)
-        for frame_index in range(num_frames):
-            # Compute the data for the current frame
-            data_current = pipeline.compute(frame_index)
-
-            # Get current positions
-            current_positions = data_current.particles.positions
+        # Frame 0 is the reference configuration, so its displacement is zero by definition
+        initial_timestep = data_initial.attributes.get('Timestep', 0)
+        print(f"{initial_timestep:<9} | {0.0:<31.6f}")
 
-            # Ensure both position arrays have the same shape
-            if initial_positions.shape != current_positions.shape:
-                 print(f"Warning: Shape mismatch at frame {frame_index}. Skipping displacement calculation for this frame.")
-                 current_timestep = data_current.attributes.get('Timestep', frame_index)
-                 print(f"{current_timestep:<9} | N/A") # Indicate displacement not calculated
-                 continue # Skip displacement calculation for this frame
-
-            # Calculate displacement vectors
-            displacements = current_positions - initial_positions
-
-            # Calculate the magnitude of displacement for each particle
-            displacement_magnitudes = np.linalg.norm(displacements, axis=1)
+        # Loop through the remaining timesteps; frame 0 was already evaluated above
+        for frame_index in range(1, num_frames):
+            # Compute the data for the current frame
+            try:
+                data_current = pipeline.compute(frame_index)
+            except RuntimeError as e:
+                # Evaluate the file source alone for the frame's timestep; an I/O or parse error in
+                # the frame itself raises again here instead of passing as a displacement failure
+                source_data = pipeline.source.compute(frame_index)
+                current_timestep = source_data.attributes.get('Timestep', frame_index)
+                # The modifier fails when the particles cannot be mapped onto the reference frame
+                print(f"Warning: Displacements could not be computed at frame {frame_index} ({e}). Skipping displacement calculation for this frame.")
+                print(f"{current_timestep:<9} | N/A") # Indicate displacement not calculated
+                continue # Skip displacement calculation for this frame
 
-            # Calculate the average displacement magnitude across all particles
-            average_displacement_magnitude = np.mean(displacement_magnitudes)
+            # Average displacement magnitude across all particles
+            average_displacement_magnitude = np.mean(data_current.particles['Displacement Magnitude'])
 
             # Get the current timestep value (using frame_index as a fallback)
             current_timestep = data_current.attributes.get('Timestep', frame_index)
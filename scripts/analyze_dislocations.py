@@ -1,83 +1,173 @@
 import numpy as np
-from scipy.spatial import Voronoi
+from scipy.spatial import Voronoi, cKDTree
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 import sys
 import pandas as pd
 import os
+import io
+import mmap
+import re
+from concurrent.futures import ProcessPoolExecutor
 
-def read_lammps_dump(filename, target_timesteps=None):
-    """Read LAMMPS dump file and return data for specified timesteps."""
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional; atom blocks are parsed with np.loadtxt instead
+    HAVE_NUMBA = False
+
+# Columns of interest in the dump ATOMS section
+TYPE_COL = 1
+X_COL = 2
+CSP_COL = 10
+
+FRAME_MARKER_RE = re.compile(rb'^ITEM: TIMESTEP', re.MULTILINE)
+
+if HAVE_NUMBA:
+    from lammps_tokens import parse_token
+
+    @njit(cache=True)
+    def _parse_atoms(buf, positions, types, csp):
+        """Scan atom lines from a byte buffer into the preallocated arrays; return the row count."""
+        n = types.size
+        size = buf.size
+        i = 0
+        row = 0
+        while row < n and i < size:
+            col = 0
+            while i < size and buf[i] != 10:  # until '\n'
+                c = buf[i]
+                if c == 32 or c == 9 or c == 13:  # whitespace, including '\r'
+                    i += 1
+                    continue
+                s = i
+                while i < size and buf[i] != 32 and buf[i] != 9 and buf[i] != 10 and buf[i] != 13:
+                    i += 1
+                if col == TYPE_COL or X_COL <= col < X_COL + 3 or col == CSP_COL:
+                    value = parse_token(buf, s, i)
+                    if col == TYPE_COL:
+                        if not np.isfinite(value):
+                            raise ValueError("could not convert a dump atom type to int")
+                        types[row] = np.int32(value)
+                    elif col == CSP_COL:
+                        csp[row] = value
+                    else:
+                        positions[row, col - X_COL] = value
+                # Columns we do not need are skipped without parsing
+                col += 1
+            i += 1
+            # Blank lines are skipped; a short row is an error, as it is for np.loadtxt
+            if col > CSP_COL:
+                row += 1
+            elif col > 0:
+                raise ValueError("dump atom row has too few columns")
+        return row
+
+def parse_atom_block(block, n_atoms):
+    """Parse a block of dump atom lines (bytes) into positions, types and csp arrays.
+
+    Positions stay float64 so coordinates round-trip at full dump precision; csp is only
+    thresholded and stacked over frames, so it is stored as float32.
+    """
+    # The atom count is known from the frame header, so the typed outputs are allocated up front
+    positions = np.empty((n_atoms, 3), dtype=np.float64)
+    types = np.empty(n_atoms, dtype=np.int32)
+    csp = np.empty(n_atoms, dtype=np.float32)
+    if HAVE_NUMBA:
+        n_read = _parse_atoms(np.frombuffer(block, dtype=np.uint8), positions, types, csp)
+    else:
+        arr = np.loadtxt(io.BytesIO(block), usecols=(TYPE_COL, X_COL, X_COL + 1, X_COL + 2, CSP_COL), ndmin=2)
+        n_read = len(arr)
+        types[:n_read] = arr[:, 0]
+        positions[:n_read] = arr[:, 1:4]
+        csp[:n_read] = arr[:, 4]
+    if n_read < n_atoms:
+        return positions[:n_read], types[:n_read], csp[:n_read]
+    return positions, types, csp
+
+def index_frames(buf):
+    """Return the byte offset of every 'ITEM: TIMESTEP' marker in a dump buffer."""
+    return [m.start() for m in FRAME_MARKER_RE.finditer(buf)]
+
+def _next_line(buf, pos):
+    """Return the line starting at pos (without newline) and the offset of the next line."""
+    eol = buf.find(b'\n', pos)
+    if eol == -1:
+        eol = len(buf)
+    return buf[pos:eol], eol + 1
+
+def read_frame_timestep(buf, start):
+    """Read the timestep of the frame whose marker is at byte offset start."""
+    _, pos = _next_line(buf, start)
+    line, _ = _next_line(buf, pos)
+    return int(line)
+
+def parse_frame(buf, start, end):
+    """Parse the frame occupying buf[start:end] into the per-timestep data dict."""
+    pos = buf.find(b'ITEM: NUMBER OF ATOMS', start, end)
+    _, pos = _next_line(buf, pos)
+    line, _ = _next_line(buf, pos)
+    n_atoms = int(line)
+
+    pos = buf.find(b'ITEM: BOX BOUNDS', start, end)
+    _, pos = _next_line(buf, pos)
+    # (3, 2) array of [lo, hi] per axis, so volumes are a single vectorized product
+    box_bounds = np.empty((3, 2), dtype=np.float64)
+    for axis in range(3):
+        line, pos = _next_line(buf, pos)
+        bounds = line.split()
+        box_bounds[axis] = float(bounds[0]), float(bounds[1])
+
+    pos = buf.find(b'ITEM: ATOMS', start, end)
+    _, pos = _next_line(buf, pos)
+    positions, types, csp = parse_atom_block(buf[pos:end], n_atoms)
+    return {
+        'positions': positions,
+        'types': types,
+        'csp': csp,
+        'box_bounds': box_bounds
+    }
+
+def _read_frame(full_path, start, end):
+    """Worker: map the dump file and parse the single frame at buf[start:end]."""
+    with open(full_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return parse_frame(mm, start, end)
+
+def read_lammps_dump(filename, target_timesteps=None, max_workers=1):
+    """Read LAMMPS dump file and return data for specified timesteps.
+
+    Frames are parsed serially by default; pass max_workers > 1 (or None for one worker per
+    core) to decode them in worker processes, which pays process start-up and copies every
+    frame back to the parent, so it only helps for large dumps.
+    """
     # Update path to look in the outputs directory
     full_path = os.path.join('outputs', filename)
     print(f"Reading file: {full_path}")
     data = {}  # Dictionary to store data for each timestep
-    current_timestep = None
-    positions = []
-    types = []
-    csp = []
-    box_bounds = None
-    reading_atoms = False
-    atoms_expected = None
-    atoms_read = 0
+    if os.path.getsize(full_path) == 0:
+        return data
     
-    # Use the full_path to open the file
-    with open(full_path, 'r') as f:
-        for line in f:
-            if 'ITEM: TIMESTEP' in line:
-                if current_timestep is not None and atoms_read > 0:
-                    # Save data for previous timestep
-                    if target_timesteps is None or current_timestep in target_timesteps:
-                        data[current_timestep] = {
-                            'positions': np.array(positions),
-                            'types': np.array(types),
-                            'csp': np.array(csp),
-                            'box_bounds': box_bounds
-                        }
-                current_timestep = int(next(f))
-                print(f"Processing timestep: {current_timestep}")
-                positions = []
-                types = []
-                csp = []
-                reading_atoms = False
-                atoms_expected = None
-                atoms_read = 0
-            elif 'ITEM: NUMBER OF ATOMS' in line:
-                atoms_expected = int(next(f))
-            elif 'ITEM: BOX BOUNDS' in line:
-                box_bounds = []
-                for _ in range(3):
-                    bounds = next(f).split()
-                    box_bounds.append([float(bounds[0]), float(bounds[1])])
-            elif 'ITEM: ATOMS' in line:
-                reading_atoms = True
-                continue
-            elif reading_atoms:
-                try:
-                    parts = line.split()
-                    if len(parts) >= 11:
-                        atom_id = int(parts[0])
-                        atom_type = int(parts[1])
-                        x, y, z = map(float, parts[2:5])
-                        csp_value = float(parts[10])
-                        positions.append([x, y, z])
-                        types.append(atom_type)
-                        csp.append(csp_value)
-                        atoms_read += 1
-                        if atoms_expected is not None and atoms_read >= atoms_expected:
-                            reading_atoms = False
-                except (ValueError, IndexError):
-                    continue
+    # Map the file and locate every frame once; frames that are not requested are never parsed
+    with open(full_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        offsets = index_frames(mm)
+        frames = []
+        for start, end in zip(offsets, offsets[1:] + [len(mm)]):
+            timestep = read_frame_timestep(mm, start)
+            if target_timesteps is None or timestep in target_timesteps:
+                frames.append((timestep, start, end))
+        
+        if max_workers == 1 or len(frames) < 2:
+            for timestep, start, end in frames:
+                print(f"Processing timestep: {timestep}")
+                data[timestep] = parse_frame(mm, start, end)
+            return data
     
-    # Save data for the last timestep
-    if current_timestep is not None and atoms_read > 0:
-        if target_timesteps is None or current_timestep in target_timesteps:
-            data[current_timestep] = {
-                'positions': np.array(positions),
-                'types': np.array(types),
-                'csp': np.array(csp),
-                'box_bounds': box_bounds
-            }
+    # Each worker maps the file itself and decodes its own byte range
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_read_frame, full_path, start, end) for _, start, end in frames]
+        for (timestep, _, _), future in zip(frames, futures):
+            data[timestep] = future.result()
+            print(f"Processing timestep: {timestep}")
     
     return data
 
@@ -93,23 +183,18 @@ def identify_grain_boundaries(positions, types):
         return [], []
     
     # Calculate Voronoi diagram for grain centers
-    grain_centers = []
-    for grain_type in unique_types:
-        grain_atoms = positions[types == grain_type]
-        center = np.mean(grain_atoms, axis=0)
-        grain_centers.append(center)
-    
-    grain_centers = np.array(grain_centers)
+    # Sort atoms by grain type once and sum each contiguous run, instead of masking per grain
+    order = np.argsort(types, kind='stable')
+    _, starts, counts = np.unique(types[order], return_index=True, return_counts=True)
+    sums = np.add.reduceat(np.asarray(positions, dtype=np.float64)[order], starts, axis=0)
+    grain_centers = sums / counts[:, None]
     vor = Voronoi(grain_centers)
     
-    # Find atoms near grain boundaries
-    boundary_atoms = []
-    for i, point in enumerate(positions):
-        # Calculate distance to all grain centers
-        distances = np.linalg.norm(grain_centers - point, axis=1)
-        # If atom is close to multiple grain centers, it's near a boundary
-        if np.sum(distances < 5.0) > 1:  # 5.0 Å threshold
-            boundary_atoms.append(i)
+    # Find atoms near grain boundaries: an atom close to multiple grain centers
+    # is near a boundary. Count the centers within 5.0 Å of every atom in one KD-tree query.
+    tree = cKDTree(grain_centers)
+    counts = tree.query_ball_point(positions, r=5.0, return_length=True)
+    boundary_atoms = np.flatnonzero(counts > 1).tolist()
     
     print(f"Identified {len(boundary_atoms)} boundary atoms")
     return boundary_atoms, grain_centers
@@ -132,33 +217,24 @@ def calculate_dislocation_density(positions, dislocation_atoms, box_volume):
 def analyze_time_evolution(data, stress_strain_data=None):
     """Analyze dislocation evolution over time and correlate with stress-strain data."""
     timesteps = sorted(data.keys())
-    dislocation_densities = []
-    n_dislocations = []
-    n_grains = []
     
-    for timestep in timesteps:
-        frame_data = data[timestep]
-        positions = frame_data['positions']
-        types = frame_data['types']
-        csp = frame_data['csp']
-        box_bounds = frame_data['box_bounds']
-        
-        # Calculate box volume
-        box_volume = 1.0
-        for bounds in box_bounds:
-            box_volume *= (bounds[1] - bounds[0])
-        box_volume *= 1e-30  # Convert from Å³ to m³
-        
-        # Identify dislocations
-        dislocation_atoms = csp > 2.0
-        n_dislocations.append(np.sum(dislocation_atoms))
-        
-        # Calculate dislocation density
-        density = calculate_dislocation_density(positions, dislocation_atoms, box_volume)
-        dislocation_densities.append(density)
-        
-        # Count unique grain types
-        n_grains.append(len(np.unique(types)))
+    # Box volumes for all frames at once: (T, 3, 2) bounds -> (T,) volumes
+    box_arr = np.array([data[t]['box_bounds'] for t in timesteps]).reshape(-1, 3, 2)
+    box_sizes = box_arr[:, :, 1] - box_arr[:, :, 0]
+    box_volumes = box_sizes.prod(axis=1) * 1e-30  # Convert from Å³ to m³
+    
+    # Identify dislocations: with a constant atom count, threshold every frame in one (T, N) pass
+    csp_frames = [data[t]['csp'] for t in timesteps]
+    if csp_frames and all(len(csp) == len(csp_frames[0]) for csp in csp_frames):
+        n_dislocations = (np.stack(csp_frames) > 2.0).sum(axis=1)
+    else:
+        n_dislocations = np.array([np.count_nonzero(csp > 2.0) for csp in csp_frames], dtype=np.int64)
+    
+    # Count unique grain types
+    n_grains = [np.unique(data[t]['types']).size for t in timesteps]
+    
+    # Calculate dislocation density (same units as calculate_dislocation_density)
+    dislocation_densities = n_dislocations * 1e-10 / box_volumes
     
     # Create time evolution plots (output to results directory)
     plt.figure(figsize=(15, 10))
@@ -186,14 +262,11 @@ def analyze_time_evolution(data, stress_strain_data=None):
     
     # If stress-strain data is available, create correlation plot (output to results directory)
     if stress_strain_data is not None:
-        # Match timesteps between dislocation densities and stress-strain data
-        strain_map = dict(zip(stress_strain_data['timestep'], stress_strain_data['strain']))
-        matched_strain = []
-        matched_density = []
-        for t, d in zip(timesteps, dislocation_densities):
-            if t in strain_map:
-                matched_strain.append(strain_map[t])
-                matched_density.append(d)
+        # Match timesteps between dislocation densities and stress-strain data with a sorted join
+        _, density_idx, strain_idx = np.intersect1d(
+            timesteps, stress_strain_data['timestep'].to_numpy(), return_indices=True)
+        matched_strain = stress_strain_data['strain'].to_numpy()[strain_idx].tolist()
+        matched_density = dislocation_densities[density_idx].tolist()
         if matched_strain and matched_density:
             plt.figure(figsize=(10, 6))
             plt.scatter(matched_strain, matched_density, c='b', alpha=0.5)
@@ -227,11 +300,15 @@ def export_frame_to_xyz(data, timestep, output_file):
     with open(full_output_path, 'w') as f:
         f.write(f"{len(positions)}\n")
         f.write(f"Frame at timestep {timestep}\n")
-        for i, (pos, t, c) in enumerate(zip(positions, types, csp)):
-            f.write(f"{t} {pos[0]} {pos[1]} {pos[2]} {c}\n")
+        # csp is float32, so it is written with the 7 significant digits it actually holds
+        np.savetxt(f, np.column_stack([types, positions, csp]), fmt='%d %.6f %.6f %.6f %.7g')
     print(f"Exported frame at timestep {timestep} to {full_output_path}")
 
-def main():
+def main(data=None, max_workers=1):
+    """Run the full analysis; data may be a dict already returned by read_lammps_dump.
+
+    max_workers is passed to read_lammps_dump when the dump still has to be read.
+    """
     try:
         # Read stress-strain data if available (from outputs directory)
         try:
@@ -244,8 +321,9 @@ def main():
             print("Proceeding without correlation analysis.")
             stress_strain_data = None
         
-        # Read LAMMPS dump file (from outputs directory)
-        data = read_lammps_dump('dump.voro')
+        # Read LAMMPS dump file (from outputs directory) unless the caller already did
+        if data is None:
+            data = read_lammps_dump('dump.voro', max_workers=max_workers)
         
         # Analyze time evolution
         evolution_data = analyze_time_evolution(data, stress_strain_data)
@@ -265,35 +343,35 @@ def main():
             f.write(f"Average number of grains: {np.mean(evolution_data['n_grains']):.1f}\n\n")
             
             # Calculate statistics for different phases
-            timesteps = evolution_data['timesteps']
-            densities = evolution_data['dislocation_densities']
+            # Timesteps are sorted, so each phase is a contiguous slice of the densities
+            timesteps = np.asarray(evolution_data['timesteps'])
+            densities = np.asarray(evolution_data['dislocation_densities'])
+            initial_end = np.searchsorted(timesteps, 1000, side='right')
+            middle_end = np.searchsorted(timesteps, 5000, side='right')
             
             # Initial phase (0-1000)
-            initial_mask = [t <= 1000 for t in timesteps]
-            initial_densities = [d for d, m in zip(densities, initial_mask) if m]
+            initial_densities = densities[:initial_end]
             
             # Middle phase (1000-5000)
-            middle_mask = [(t > 1000 and t <= 5000) for t in timesteps]
-            middle_densities = [d for d, m in zip(densities, middle_mask) if m]
+            middle_densities = densities[initial_end:middle_end]
             
             # Final phase (5000-end)
-            final_mask = [t > 5000 for t in timesteps]
-            final_densities = [d for d, m in zip(densities, final_mask) if m]
+            final_densities = densities[middle_end:]
             
             f.write("## Key Observations\n\n")
             f.write("1. Dislocation density evolution shows the following trends:\n")
             # Add checks to avoid calculating mean of empty slices
-            if initial_densities:
+            if initial_densities.size:
                 f.write(f"   - Initial phase (0-1000): Average density {np.mean(initial_densities):.2e} m^-2\n")
             else:
                 f.write("   - Initial phase (0-1000): No data in this phase\n")
 
-            if middle_densities:
+            if middle_densities.size:
                 f.write(f"   - Middle phase (1000-5000): Average density {np.mean(middle_densities):.2e} m^-2\n")
             else:
                 f.write("   - Middle phase (1000-5000): No data in this phase\n")
 
-            if final_densities:
+            if final_densities.size:
                 f.write(f"   - Final phase (5000-end): Average density {np.mean(final_densities):.2e} m^-2\n\n")
             else:
                 f.write("   - Final phase (5000-end): No data in this phase\n\n")
@@ -335,8 +413,12 @@ if __name__ == "__main__":
     # This is important for relative paths like 'outputs/dump.voro' to work correctly
     os.chdir(script_dir)
 
+    # Optional first argument: number of worker processes for parsing frames (0 = one per core)
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    max_workers = max_workers or None
+
     # Quick scan for unique grain types per frame
-    data = read_lammps_dump('dump.voro') # Path is now relative to the script's new cwd
+    data = read_lammps_dump('dump.voro', max_workers=max_workers) # Path is now relative to the script's new cwd
     print("\nQuick scan: Unique grain types per frame:")
     for t, frame in data.items():
         n_grains = len(np.unique(frame['types']))
@@ -345,5 +427,5 @@ if __name__ == "__main__":
     # Export a frame (e.g., timestep 0) for visualization
     export_frame_to_xyz(data, 0, 'frame_0.xyz') # Output path is now relative to the script's new cwd
 
-    # Continue with the main analysis as before
-    main() 
\ No newline at end of file
+    # Continue with the main analysis, reusing the frames parsed above
+    main(data) 
\ No newline at end of file
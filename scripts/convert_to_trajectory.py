@@ -1,61 +1,62 @@
 import numpy as np
 import pandas as pd
+import os
+import io
+import itertools
 from tqdm import tqdm
 
 def read_dump_voro(filename):
     """Read dump.voro file and extract trajectory data"""
     data = []
     current_timestep = None
-    current_data = []
     box_bounds = None
-    atom_ids = []
+    atoms_expected = 0
+    
+    # Progress is reported in bytes and refreshed once per frame, not on every line
+    pbar = tqdm(total=os.path.getsize(filename), unit='B', unit_scale=True)
+    bytes_read = 0
     
     with open(filename, 'r') as f:
-        for line in tqdm(f):
-            line = line.strip()
+        # Only ITEM headers reach this loop; atom lines are consumed by the ATOMS branch
+        for line in f:
+            bytes_read += len(line)
             
             # Check for timestep
             if line.startswith('ITEM: TIMESTEP'):
-                if current_timestep is not None and current_data:
-                    data.append((current_timestep, current_data, box_bounds, atom_ids))
-                current_data = []
-                atom_ids = []
+                pbar.update(bytes_read)
+                bytes_read = 0
                 current_timestep = int(next(f))
-                continue
+            
+            elif line.startswith('ITEM: NUMBER OF ATOMS'):
+                atoms_expected = int(next(f))
             
             # Get box bounds
-            if line.startswith('ITEM: BOX BOUNDS'):
+            elif line.startswith('ITEM: BOX BOUNDS'):
                 box_bounds = []
                 for _ in range(3):
                     bounds = list(map(float, next(f).split()))
                     box_bounds.append(bounds)
-                continue
-                
-            # Skip headers except for ATOMS
-            if line.startswith('ITEM:'):
-                if not line.startswith('ITEM: ATOMS'):
-                    continue
-                # Get column indices from ATOMS header
-                headers = next(f).strip().split()
+            
+            elif line.startswith('ITEM: ATOMS'):
+                # Get column indices from the names that follow 'ITEM: ATOMS'
+                headers = line.split()[2:]
                 id_idx = headers.index('id') if 'id' in headers else 0
                 x_idx = headers.index('x') if 'x' in headers else 1
                 y_idx = headers.index('y') if 'y' in headers else 2
                 z_idx = headers.index('z') if 'z' in headers else 3
-                continue
                 
-            # Parse data lines
-            if current_timestep is not None:
-                try:
-                    values = list(map(float, line.split()))
-                    if len(values) >= 4:  # Ensure we have id and x,y,z coordinates
-                        atom_ids.append(int(values[id_idx]))
-                        current_data.append([values[x_idx], values[y_idx], values[z_idx]])
-                except ValueError:
+                # Read exactly atoms_expected data lines and parse them into typed arrays in one call
+                block = ''.join(itertools.islice(f, atoms_expected))
+                bytes_read += len(block)
+                if current_timestep is None or not block:
                     continue
+                arr = np.loadtxt(io.StringIO(block), usecols=(id_idx, x_idx, y_idx, z_idx), ndmin=2)
+                atom_ids = arr[:, 0].astype(np.int64)
+                positions = arr[:, 1:]
+                data.append((current_timestep, positions, box_bounds, atom_ids))
     
-    # Add the last timestep
-    if current_timestep is not None and current_data:
-        data.append((current_timestep, current_data, box_bounds, atom_ids))
+    pbar.update(pbar.total - pbar.n)
+    pbar.close()
     
     return data
 
@@ -79,8 +80,11 @@ def write_trajectory(data, output_file):
                 f.write("0.0 100.0\n")
             
             f.write("ITEM: ATOMS id type x y z\n")
-            for i, (atom_id, pos) in enumerate(zip(atom_ids, positions), 1):
-                f.write(f"{atom_id} 1 {pos[0]:.6f} {pos[1]:.6f} {pos[2]:.6f}\n")
+            # Format the whole frame in one call instead of one f-string per atom
+            atoms = np.column_stack([np.asarray(atom_ids, dtype=np.int64),
+                                     np.ones(len(positions), dtype=np.int64),
+                                     np.asarray(positions, dtype=np.float64).reshape(-1, 3)])
+            np.savetxt(f, atoms, fmt='%d %d %.6f %.6f %.6f')
 
 def verify_output(input_file, output_file):
     """Verify the output file matches the input format"""
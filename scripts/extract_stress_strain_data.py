@@ -1,14 +1,14 @@
 import numpy as np
 import re
+import io
 
 def extract_stress_strain_data(log_file, loading_direction='z'):
     """Extracts stress and strain data from a LAMMPS log file.
     Assumes engineering strain calculated from box dimensions.
+    Returns an (N, 3) array of (timestep, strain, stress) rows.
     """
-    stress_strain_data = []
     header_line_found = False
     header_indices = {}
-    initial_Lx, initial_Ly, initial_Lz = None, None, None
 
     stress_component_key = {'x': 'Pxx', 'y': 'Pyy', 'z': 'Pzz'}[loading_direction] # Key for stress column
     # Need to map LAMMPS output name (e.g., Pxx) to a more standard name if desired, but let's use LAMMPS name for now.
@@ -21,7 +21,7 @@ def extract_stress_strain_data(log_file, loading_direction='z'):
                 line = line.strip()
 
                 # Try to find the header line using regex for more robustness
-                if not header_line_found and re.match(r'^\s*Step', line):
+                if re.match(r'^\s*Step', line):
                     header = line.split()
                     # Check if all required keys are in the header
                     if all(key in header for key in required_keys):
@@ -35,40 +35,18 @@ def extract_stress_strain_data(log_file, loading_direction='z'):
                              if key in header:
                                   header_indices[key] = header.index(key)
                         print("Log file header identified.")
-                        continue # Move to next line after finding header
-
-                # If header is found and the line looks like a data line
-                # Check if number of values matches the number of headers found (more robust)
-                elif header_line_found and len(line.split()) == len(header):
-                    values = line.split()
-                    try:
-                        step = int(values[header_indices['Step']])
-                        stress_value = float(values[header_indices[stress_component_key]])
-                        Lx = float(values[header_indices['Lx']])
-                        Ly = float(values[header_indices['Ly']])
-                        Lz = float(values[header_indices['Lz']])
-
-                        if step == 0:
-                            initial_Lx, initial_Ly, initial_Lz = Lx, Ly, Lz
-                            strain = 0.0
-                        else:
-                             if loading_direction == 'x':
-                                 strain = (Lx - initial_Lx) / initial_Lx
-                             elif loading_direction == 'y':
-                                 strain = (Ly - initial_Ly) / initial_Ly
-                             elif loading_direction == 'z':
-                                 strain = (Lz - initial_Lz) / initial_Lz
-                             else:
-                                 strain = 0.0 # Should not happen with valid loading_direction
-
-                        # Append data: (timestep, strain, stress_in_loading_direction)
-                        # Note: LAMMPS pressure/stress is negative of solid mechanics stress
-                        stress_strain_data.append((step, strain, -stress_value))
-
-                    except (ValueError, IndexError) as e:
-                        # Skip lines that don't contain expected numerical data after header is found
-                        # print(f"Warning: Skipping data line due to parsing error: {line} - {e}")
-                        pass # Silently skip lines that don't parse correctly
+                        break
+
+            if not header_line_found:
+                 print("Error: Could not find the thermo output header line in the log file.")
+                 print("Please ensure 'thermo_style custom' is configured correctly in your LAMMPS input.") # More specific error message
+                 return None
+
+            # Collect the thermo rows (a step number followed by as many values as the header has columns)
+            # and parse them in a single NumPy call
+            data_row = re.compile(r'^\s*\d+(?:\s+\S+){%d}\s*$' % (len(header) - 1))
+            data_block = io.StringIO()
+            data_block.writelines(line for line in f if data_row.match(line))
 
     except FileNotFoundError:
         print(f"Error: Log file not found at {log_file}")
@@ -77,16 +55,29 @@ def extract_stress_strain_data(log_file, loading_direction='z'):
         print(f"An unexpected error occurred while reading the log file: {e}")
         return None
 
-    if not header_line_found:
-         print("Error: Could not find the thermo output header line in the log file.")
-         print("Please ensure 'thermo_style custom' is configured correctly in your LAMMPS input.") # More specific error message
-         return None
+    if data_block.tell() == 0:
+        return np.empty((0, 3))
+    data_block.seek(0)
+
+    # Columns: Step, stress in loading direction, Lx, Ly, Lz
+    usecols = [header_indices[key] for key in required_keys]
+    arr = np.genfromtxt(data_block, usecols=usecols, ndmin=2)
+    # Skip lines that don't contain expected numerical data
+    arr = arr[~np.isnan(arr).any(axis=1)]
+
+    step = arr[:, 0]
+    L = arr[:, 2 + 'xyz'.index(loading_direction)]
+    # Strain is measured against the box length of the most recent step-0 row
+    reference = np.maximum.accumulate(np.where(step == 0, np.arange(len(step)), 0))
+    strain = (L - L[reference]) / L[reference]
 
-    return stress_strain_data
+    # Rows: (timestep, strain, stress_in_loading_direction)
+    # Note: LAMMPS pressure/stress is negative of solid mechanics stress
+    return np.column_stack((step, strain, -arr[:, 1]))
 
 def write_stress_strain_data(data, output_file, loading_direction='z'):
     """Writes extracted stress-strain data to a file."""
-    if data is None or not data:
+    if data is None or len(data) == 0:
         print("No data to write.")
         return
 
@@ -96,10 +87,8 @@ def write_stress_strain_data(data, output_file, loading_direction='z'):
         # Consider other stress components if needed for shear, etc.
         # For a simple tensile curve, the stress component in the loading direction is key.
 
-        with open(output_file, 'w') as f:
-            f.write(f"# Timestep, Strain, Stress ({stress_label})\n") # Header
-            for step, strain, stress in data:
-                f.write(f"{step}, {strain:.6e}, {stress:.6e}\n")
+        np.savetxt(output_file, data, fmt=['%d', '%.6e', '%.6e'], delimiter=', ',
+                   header=f"# Timestep, Strain, Stress ({stress_label})", comments='')
         print(f"Stress-strain data written to {output_file}")
     except Exception as e:
         print(f"Error writing data to file: {e}")
@@ -112,7 +101,7 @@ if __name__ == "__main__":
 
     stress_strain_data = extract_stress_strain_data(log_file, loading_direction)
 
-    if stress_strain_data:
+    if stress_strain_data is not None and len(stress_strain_data) > 0:
         write_stress_strain_data(stress_strain_data, output_file, loading_direction)
     else:
-        print("Failed to extract stress-strain data.") 
\ No newline at end of file
+        print("Failed to extract stress-strain data.")
@@ -1,14 +1,12 @@
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle, ListStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import (SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, PageBreak, ListFlowable, ListItem, Frame, PageTemplate)
-from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT
-from reportlab.pdfgen import canvas
 import os
 import datetime
+import functools
+import itertools
 import re
 
+# ReportLab is imported inside the functions that build the PDF, so importing this
+# module (e.g. for the markdown helpers) stays cheap
+
 # Enhanced color scheme
 COLORS = {
     'primary': '#1e40af',      # Rich blue
@@ -24,63 +22,110 @@ COLORS = {
     'border': '#e5e7eb'        # Light gray border
 }
 
-# Helper to read markdown files and process them
-def read_markdown_file(filepath):
+# Markdown patterns used by iter_markdown_flowables
+# Headings and asterisks are rewritten in a single pass; see _markdown_substitution
+_RE_MARKDOWN = re.compile(r'^#+\s+(.+)$|\*')
+_RE_TABLE_ROW = re.compile(r'^\|?\s*[-\w ]+\s*\|')
+
+_NEXT_STEPS = '## Next Steps'
+
+def parse_markdown_blocks(lines):
+    """Split markdown lines into ('text', line) and ('table', table_lines) blocks."""
+    table_lines = []  # Non-empty while inside a table
+    for line in lines:
+        if table_lines:
+            if '|' in line:
+                table_lines.append(line)
+                continue
+            # End of table
+            if len(table_lines) > 1:
+                yield 'table', table_lines
+            table_lines = []
+            if line.strip():
+                yield 'text', line
+        # Detect start of a markdown table (header row); the substring test is far
+        # cheaper than the regex and rejects almost every line first
+        elif '|' in line and _RE_TABLE_ROW.match(line):
+            table_lines = [line]
+        elif line.strip():
+            yield 'text', line
+    # If file ends with a table
+    if len(table_lines) > 1:
+        yield 'table', table_lines
+
+def _markdown_substitution(match):
+    """Replacement for _RE_MARKDOWN: bold a heading (without asterisks), drop a lone asterisk."""
+    heading = match.group(1)
+    if heading is None:
+        return ''
+    return f"<b>{heading.replace('*', '')}</b>"
+
+def normalize_markdown_lines(f):
+    """Yield the lines of a markdown file without "Next Steps" sections, with headings in bold
+    and asterisks removed."""
+    skipping = False  # Inside a "Next Steps" section, which runs until the next '##'
+    for line in f:
+        line = line.rstrip('\n')
+        kept = ''
+        while line:
+            if skipping:
+                pos = line.find('##')
+                if pos == -1:
+                    line = ''
+                    break
+                line = line[pos:]
+                skipping = False
+            pos = line.find(_NEXT_STEPS)
+            if pos == -1:
+                kept += line
+                break
+            kept += line[:pos]
+            line = line[pos + len(_NEXT_STEPS):]
+            skipping = True
+        if not kept and skipping:
+            continue
+
+        # Convert markdown headings to bold text and remove asterisks in one scan
+        yield _RE_MARKDOWN.sub(_markdown_substitution, kept)
+
+def iter_markdown_flowables(filepath, styles):
+    """Lazily yield the Paragraph, Table and Spacer flowables for a markdown file."""
+    from reportlab.platypus import Paragraph, Spacer
+
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        # Remove "Next Steps" sections
-        content = re.sub(r'## Next Steps.*?(?=##|\Z)', '', content, flags=re.DOTALL)
-        
-        # Convert markdown headings to bold text
-        content = re.sub(r'^#+\s+(.+)$', r'<b>\1</b>', content, flags=re.MULTILINE)
-        
-        # Remove asterisks from text
-        content = re.sub(r'\*', '', content)
-        
-        # --- Robust table detection and splitting ---
-        lines = content.split('\n')
-        processed_content = []
-        table_lines = []
-        in_table = False
-        for line in lines:
-            # Detect start of a markdown table (header row)
-            if re.match(r'^\|?\s*[-\w ]+\s*\|', line) and '|' in line and not in_table:
-                in_table = True
-                table_lines = [line]
-            elif in_table:
-                if '|' in line:
-                    table_lines.append(line)
+            # Consecutive text paragraphs are folded into one Paragraph; only tables break a run
+            paras = []
+            for kind, payload in parse_markdown_blocks(normalize_markdown_lines(f)):
+                if kind == 'table':
+                    if paras:
+                        yield Paragraph('<br/><br/>'.join(paras), styles['CustomBody'])
+                        yield Spacer(1, 8)
+                        paras = []
+                    yield process_markdown_table(payload)
+                    yield Spacer(1, 18)
                 else:
-                    # End of table
-                    if len(table_lines) > 1:
-                        processed_content.append(process_markdown_table(table_lines))
-                    table_lines = []
-                    in_table = False
-                    if line.strip():
-                        processed_content.append(line)
-            else:
-                if line.strip():
-                    processed_content.append(line)
-        # If file ends with a table
-        if in_table and len(table_lines) > 1:
-            processed_content.append(process_markdown_table(table_lines))
-
-        return processed_content
+                    paras.append(payload)
+            if paras:
+                yield Paragraph('<br/><br/>'.join(paras), styles['CustomBody'])
+                yield Spacer(1, 8)
     except Exception as e:
-        return f"[Could not read {filepath}: {e}]"
+        yield Paragraph(f"[Could not read {filepath}: {e}]", styles['CustomBody'])
+        yield Spacer(1, 8)
 
 def process_markdown_table(table_lines):
     """Process markdown table into a visually appealing ReportLab table."""
-    # Remove header separator line
-    table_lines = [line for line in table_lines if not line.startswith('|-')]
+    from reportlab.lib import colors
+    from reportlab.platypus import Table, TableStyle
+
+    # Remove header separator line (always the row right under the header)
+    if len(table_lines) > 1 and table_lines[1].startswith('|-'):
+        table_lines = table_lines[:1] + table_lines[2:]
 
-    # Process each line
+    # Process each line (asterisks were already removed by normalize_markdown_lines)
     data = []
     for line in table_lines:
-        cells = [cell.strip().replace('*', '') for cell in line.strip('|').split('|')]
-        cells = [cell.strip() for cell in cells]
+        cells = [cell.strip() for cell in line.strip('|').split('|')]
         if len(cells) > 1:
             cells[1] = cells[1].replace(' ', '')
         data.append(cells)
@@ -119,160 +164,337 @@ def process_markdown_table(table_lines):
         ('FONTSIZE', (0, 1), (-1, -1), 11),
     ]
 
-    # Add alternating row colors for readability
-    for i in range(1, len(data)):
-        if i % 2 == 1:
-            styles.append(('BACKGROUND', (0, i), (-1, i), colors.HexColor(COLORS['light'])))
-        else:
-            styles.append(('BACKGROUND', (0, i), (-1, i), colors.HexColor(COLORS['light'])))
+    # Add alternating row colors for readability (one range command for all data rows)
+    light = colors.HexColor(COLORS['light'])
+    styles.append(('ROWBACKGROUNDS', (0, 1), (-1, -1), [light, light]))
 
     # Add phase-based highlight (optional, can be commented out if not needed)
-    for i, row in enumerate(data[1:], 1):
-        phase = row[2].strip().lower()
-        if phase == 'initial':
-            styles.append(('TEXTCOLOR', (2, i), (2, i), colors.HexColor(COLORS['secondary'])))
-        elif phase == 'transition':
-            styles.append(('TEXTCOLOR', (2, i), (2, i), colors.HexColor(COLORS['warning'])))
-        elif phase == 'final':
-            styles.append(('TEXTCOLOR', (2, i), (2, i), colors.HexColor(COLORS['success'])))
+    # Consecutive rows of the same phase share a single TEXTCOLOR span
+    phase_colors = {
+        'initial': colors.HexColor(COLORS['secondary']),
+        'transition': colors.HexColor(COLORS['warning']),
+        'final': colors.HexColor(COLORS['success']),
+    }
+    rows = enumerate(data[1:], 1)
+    for phase, run in itertools.groupby(rows, key=lambda item: item[1][2].strip().lower()):
+        run = list(run)
+        if phase in phase_colors:
+            styles.append(('TEXTCOLOR', (2, run[0][0]), (2, run[-1][0]), phase_colors[phase]))
 
     table.setStyle(TableStyle(styles))
     return table
 
 def add_page_number(canvas, doc):
+    from reportlab.lib import colors
+    from reportlab.lib.units import inch
+
     page_num = canvas.getPageNumber()
     text = f"Voronoi2 Project Report   |   Page {page_num}"
     canvas.setFont('Helvetica-Bold', 11)
     canvas.setFillColor(colors.HexColor(COLORS['primary']))
     canvas.drawRightString(7.5*inch, 0.65*inch, text)
 
+# TOC entry styles per indentation level, built on first use; colour and size live in the
+# style, not in inline markup
+_TOC_STYLES = {}
+
 def make_toc_entry(text, level=0):
-    return Paragraph(
-        f'<font size="15" color="{COLORS["primary"]}"><b>{text}</b></font>',
-        ParagraphStyle(
-            'TOCEntry',
+    from reportlab.lib import colors
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.platypus import Paragraph
+
+    style = _TOC_STYLES.get(level)
+    if style is None:
+        style = _TOC_STYLES[level] = ParagraphStyle(
+            f'TOCEntry{level}',
             leftIndent=level*20,
             spaceAfter=14,
             spaceBefore=6,
-            fontName='Helvetica-Bold'
+            fontName='Helvetica-Bold',
+            fontSize=15,
+            textColor=colors.HexColor(COLORS['primary'])
         )
-    )
+    return Paragraph(f'<b>{text}</b>', style)
+
+@functools.lru_cache(maxsize=None)
+def _report_styles():
+    """Build the report stylesheet once; later reports reuse it."""
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle, ListStyle
+
+    # Enhanced styles with optimized spacing
+    styles = getSampleStyleSheet()
+    
+    # Cover page styles
+    styles.add(ParagraphStyle(
+        name='CoverTitle',
+        fontSize=44,
+        leading=48,
+        alignment=TA_CENTER,
+        spaceAfter=24,
+        textColor=colors.HexColor(COLORS['primary']),
+        fontName='Helvetica-Bold'
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='CoverSub',
+        fontSize=26,
+        leading=30,
+        alignment=TA_CENTER,
+        spaceAfter=20,
+        textColor=colors.HexColor(COLORS['secondary']),
+        fontName='Helvetica'
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='CoverMeta',
+        fontSize=15,
+        alignment=TA_CENTER,
+        spaceAfter=8,
+        textColor=colors.HexColor(COLORS['gray']),
+        fontName='Helvetica'
+    ))
+
+    # Section styles
+    styles.add(ParagraphStyle(
+        name='SectionHeading',
+        fontSize=30,
+        leading=34,
+        spaceAfter=20,
+        spaceBefore=24,
+        textColor=colors.HexColor(COLORS['primary']),
+        alignment=TA_LEFT,
+        fontName='Helvetica-Bold'
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='SubHeading',
+        fontSize=20,
+        leading=24,
+        spaceAfter=12,
+        spaceBefore=16,
+        textColor=colors.HexColor(COLORS['secondary']),
+        alignment=TA_LEFT,
+        fontName='Helvetica-Bold'
+    ))
+
+    # Body text styles
+    styles.add(ParagraphStyle(
+        name='CustomBody',
+        parent=styles['Normal'],
+        fontSize=12,
+        leading=16,
+        spaceAfter=10,
+        alignment=TA_JUSTIFY,
+        fontName='Helvetica',
+        textColor=colors.HexColor(COLORS['text'])
+    ))
+
+    # Table styles
+    styles.add(ParagraphStyle(
+        name='TableHeader',
+        fontSize=14,
+        alignment=TA_CENTER,
+        textColor=colors.white,
+        spaceAfter=8,
+        spaceBefore=8,
+        fontName='Helvetica-Bold'
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='TableCell',
+        fontSize=12,
+        alignment=TA_LEFT,
+        spaceAfter=6,
+        spaceBefore=6,
+        fontName='Helvetica'
+    ))
+
+    # Image caption style
+    styles.add(ParagraphStyle(
+        name='ImageCaption',
+        fontSize=13,
+        alignment=TA_CENTER,
+        textColor=colors.HexColor(COLORS['gray']),
+        spaceAfter=16,
+        spaceBefore=6,
+        fontName='Helvetica-Oblique'
+    ))
+
+    # List style
+    styles.add(ListStyle(
+        name='BulletList',
+        leftIndent=24,
+        bulletIndent=16,
+        bulletFontName='Helvetica',
+        bulletFontSize=16,
+        spaceAfter=8
+    ))
+    return styles
+
+@functools.lru_cache(maxsize=None)
+def _static_tables():
+    """Data, column widths and TableStyle of the software and structure tables, built once."""
+    from reportlab.lib import colors
+    from reportlab.lib.units import inch
+    from reportlab.platypus import TableStyle
+
+    software_list = [
+        ["Software", "Purpose", "Version"],
+        ["Atomsk", "Structure Generation", "Latest"],
+        ["LAMMPS", "Molecular Dynamics Simulation", "Latest"],
+        ["OVITO/VMD", "Visualization", "Latest"],
+        ["Python", "Analysis and Scripting", "3.x"],
+        ["NumPy", "Numerical Computing", "≥1.21.0"],
+        ["SciPy", "Scientific Computing", "≥1.7.0"],
+        ["Matplotlib", "Data Visualization", "≥3.4.0"],
+        ["ASE", "Atomic Simulation Environment", "Latest"]
+    ]
+    software_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(COLORS['primary'])),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 14),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('TOPPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor(COLORS['light'])),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.HexColor(COLORS['text'])),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor(COLORS['primary'])),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor(COLORS['highlight'])]),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
+        ('TOPPADDING', (0, 1), (-1, -1), 8),
+        ('LEFTPADDING', (0, 0), (-1, -1), 8),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 8)
+    ])
+
+    structure_list = [
+        ["Directory", "Purpose"],
+        ["scripts/", "Python scripts for structure generation and analysis"],
+        ["inputs/", "LAMMPS input files and potential files"],
+        ["outputs/", "Raw simulation outputs and initial data"],
+        ["results/", "Final analysis outputs and visualizations"],
+        ["studies/", "Supplementary analysis files"],
+        ["bin/", "Executable files (e.g., Atomsk)"]
+    ]
+    structure_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(COLORS['primary'])),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 13),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 14),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor(COLORS['light'])),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.HexColor(COLORS['text'])),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor(COLORS['primary'])),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor(COLORS['light'])])
+    ])
+    return ((software_list, [2*inch, 3*inch, 1.5*inch], software_style),
+            (structure_list, [2*inch, 4.5*inch], structure_style))
+
+def _section_heading(title):
+    """Fresh SectionHeading paragraph for a report section (flowables are never shared)."""
+    from reportlab.platypus import Paragraph
+
+    return Paragraph(title, _report_styles()['SectionHeading'])
+
+def _body_paragraph(text):
+    """Fresh CustomBody paragraph for fixed report text (flowables are never shared)."""
+    from reportlab.platypus import Paragraph
+
+    return Paragraph(text, _report_styles()['CustomBody'])
+
+def _cover_flowables(date_text):
+    """Cover-page flowables; date_text is the formatted report date."""
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Paragraph, Spacer, PageBreak
+
+    styles = _report_styles()
+    story = []
+    story.append(Spacer(1, 2*inch))
+    story.append(Paragraph("Voronoi Polycrystal Molecular Dynamics Simulation", styles['CoverTitle']))
+    story.append(Paragraph("Comprehensive Project Report", styles['CoverSub']))
+    story.append(Spacer(1, 0.75*inch))
+    story.append(Paragraph(f"Author: <b>Your Name</b>", styles['CoverMeta']))
+    story.append(Paragraph(f"Date: {date_text}", styles['CoverMeta']))
+    story.append(Spacer(1, 2*inch))
+    story.append(Paragraph("<i>Generated automatically using Python and ReportLab</i>", styles['CoverMeta']))
+    story.append(PageBreak())
+    return story
+
+def _fixed_sections():
+    """Flowables for the table of contents and the fixed overview, software and structure sections."""
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Spacer, Table, PageBreak
+
+    # Flowables are built per report (ReportLab keeps layout state on them); only styles and table specs are cached
+    (software_list, software_widths, software_style), (structure_list, structure_widths, structure_style) = _static_tables()
+    story = []
+
+    # --- TABLE OF CONTENTS ---
+    story.append(_section_heading("Table of Contents"))
+    story.append(Spacer(1, 0.5*inch))
+    
+    toc_entries = [
+        ("Project Overview", 0),
+        ("Software and Tools Used", 0),
+        ("Project Structure", 0),
+        ("Results and Visualizations", 0),
+        ("Dislocation Evolution Report", 0),
+        ("Dislocation Study Report", 0),
+        ("Deformation Report", 0)
+    ]
+    
+    for entry, level in toc_entries:
+        story.append(make_toc_entry(entry, level))
+    
+    story.append(PageBreak())
+
+    # --- PROJECT OVERVIEW ---
+    story.append(_section_heading("Project Overview"))
+    story.append(_body_paragraph(
+        "This project focuses on generating a Voronoi polycrystal structure, simulating its deformation using LAMMPS, "
+        "and analyzing the evolution of dislocations and grain structure. The project combines molecular dynamics "
+        "simulation with advanced analysis techniques to study material behavior under deformation."
+    ))
+    story.append(Spacer(1, 1*inch))
+    story.append(_body_paragraph("<hr width='100%' color='#60a5fa'/>"))
+
+    # --- SOFTWARE AND TOOLS ---
+    story.append(_section_heading("Software and Tools Used"))
+    t = Table(software_list, colWidths=software_widths)
+    t.setStyle(software_style)
+    story.append(t)
+    story.append(Spacer(1, 1*inch))
+    story.append(_body_paragraph("<hr width='100%' color='#60a5fa'/>"))
+
+    # --- PROJECT STRUCTURE ---
+    story.append(_section_heading("Project Structure"))
+    t = Table(structure_list, colWidths=structure_widths)
+    t.setStyle(structure_style)
+    story.append(t)
+    story.append(Spacer(1, 12))
+    story.append(_body_paragraph("<hr width='100%' color='#60a5fa'/>"))
+    return story
 
 def create_project_report():
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import (SimpleDocTemplate, Paragraph, Spacer, Image, PageBreak)
+
     try:
         print("Building PDF...")
         if not os.path.exists("results"):
             os.makedirs("results")
         output_path = "results/project_report.pdf"
 
-        # Enhanced styles with optimized spacing
-        styles = getSampleStyleSheet()
-        
-        # Cover page styles
-        styles.add(ParagraphStyle(
-            name='CoverTitle',
-            fontSize=44,
-            leading=48,
-            alignment=TA_CENTER,
-            spaceAfter=24,
-            textColor=colors.HexColor(COLORS['primary']),
-            fontName='Helvetica-Bold'
-        ))
-        
-        styles.add(ParagraphStyle(
-            name='CoverSub',
-            fontSize=26,
-            leading=30,
-            alignment=TA_CENTER,
-            spaceAfter=20,
-            textColor=colors.HexColor(COLORS['secondary']),
-            fontName='Helvetica'
-        ))
-        
-        styles.add(ParagraphStyle(
-            name='CoverMeta',
-            fontSize=15,
-            alignment=TA_CENTER,
-            spaceAfter=8,
-            textColor=colors.HexColor(COLORS['gray']),
-            fontName='Helvetica'
-        ))
-
-        # Section styles
-        styles.add(ParagraphStyle(
-            name='SectionHeading',
-            fontSize=30,
-            leading=34,
-            spaceAfter=20,
-            spaceBefore=24,
-            textColor=colors.HexColor(COLORS['primary']),
-            alignment=TA_LEFT,
-            fontName='Helvetica-Bold'
-        ))
-        
-        styles.add(ParagraphStyle(
-            name='SubHeading',
-            fontSize=20,
-            leading=24,
-            spaceAfter=12,
-            spaceBefore=16,
-            textColor=colors.HexColor(COLORS['secondary']),
-            alignment=TA_LEFT,
-            fontName='Helvetica-Bold'
-        ))
-
-        # Body text styles
-        styles.add(ParagraphStyle(
-            name='CustomBody',
-            parent=styles['Normal'],
-            fontSize=12,
-            leading=16,
-            spaceAfter=10,
-            alignment=TA_JUSTIFY,
-            fontName='Helvetica',
-            textColor=colors.HexColor(COLORS['text'])
-        ))
-
-        # Table styles
-        styles.add(ParagraphStyle(
-            name='TableHeader',
-            fontSize=14,
-            alignment=TA_CENTER,
-            textColor=colors.white,
-            spaceAfter=8,
-            spaceBefore=8,
-            fontName='Helvetica-Bold'
-        ))
-        
-        styles.add(ParagraphStyle(
-            name='TableCell',
-            fontSize=12,
-            alignment=TA_LEFT,
-            spaceAfter=6,
-            spaceBefore=6,
-            fontName='Helvetica'
-        ))
-
-        # Image caption style
-        styles.add(ParagraphStyle(
-            name='ImageCaption',
-            fontSize=13,
-            alignment=TA_CENTER,
-            textColor=colors.HexColor(COLORS['gray']),
-            spaceAfter=16,
-            spaceBefore=6,
-            fontName='Helvetica-Oblique'
-        ))
-
-        # List style
-        styles.add(ListStyle(
-            name='BulletList',
-            leftIndent=24,
-            bulletIndent=16,
-            bulletFontName='Helvetica',
-            bulletFontSize=16,
-            spaceAfter=8
-        ))
+        styles = _report_styles()
 
         # Document setup with compact margins
         doc = SimpleDocTemplate(
@@ -297,118 +519,14 @@ def create_project_report():
         story = []
 
         # --- COVER PAGE ---
-        story.append(Spacer(1, 2*inch))
-        story.append(Paragraph("Voronoi Polycrystal Molecular Dynamics Simulation", styles['CoverTitle']))
-        story.append(Paragraph("Comprehensive Project Report", styles['CoverSub']))
-        story.append(Spacer(1, 0.75*inch))
-        story.append(Paragraph(f"Author: <b>Your Name</b>", styles['CoverMeta']))
-        story.append(Paragraph(f"Date: {datetime.date.today().strftime('%B %d, %Y')}", styles['CoverMeta']))
-        story.append(Spacer(1, 2*inch))
-        story.append(Paragraph("<i>Generated automatically using Python and ReportLab</i>", styles['CoverMeta']))
-        story.append(PageBreak())
-
-        # --- TABLE OF CONTENTS ---
-        story.append(Paragraph("Table of Contents", styles['SectionHeading']))
-        story.append(Spacer(1, 0.5*inch))
-        
-        toc_entries = [
-            ("Project Overview", 0),
-            ("Software and Tools Used", 0),
-            ("Project Structure", 0),
-            ("Results and Visualizations", 0),
-            ("Dislocation Evolution Report", 0),
-            ("Dislocation Study Report", 0),
-            ("Deformation Report", 0)
-        ]
-        
-        for entry, level in toc_entries:
-            story.append(make_toc_entry(entry, level))
-        
-        story.append(PageBreak())
+        story.extend(_cover_flowables(datetime.date.today().strftime('%B %d, %Y')))
 
-        # --- PROJECT OVERVIEW ---
-        story.append(Paragraph("Project Overview", styles['SectionHeading']))
-        story.append(Paragraph(
-            "This project focuses on generating a Voronoi polycrystal structure, simulating its deformation using LAMMPS, "
-            "and analyzing the evolution of dislocations and grain structure. The project combines molecular dynamics "
-            "simulation with advanced analysis techniques to study material behavior under deformation.",
-            styles['CustomBody']
-        ))
-        story.append(Spacer(1, 1*inch))
-        story.append(Paragraph("<hr width='100%' color='#60a5fa'/>", styles['CustomBody']))
-
-        # --- SOFTWARE AND TOOLS ---
-        story.append(Paragraph("Software and Tools Used", styles['SectionHeading']))
-        software_list = [
-            ["Software", "Purpose", "Version"],
-            ["Atomsk", "Structure Generation", "Latest"],
-            ["LAMMPS", "Molecular Dynamics Simulation", "Latest"],
-            ["OVITO/VMD", "Visualization", "Latest"],
-            ["Python", "Analysis and Scripting", "3.x"],
-            ["NumPy", "Numerical Computing", "≥1.21.0"],
-            ["SciPy", "Scientific Computing", "≥1.7.0"],
-            ["Matplotlib", "Data Visualization", "≥3.4.0"],
-            ["ASE", "Atomic Simulation Environment", "Latest"]
-        ]
-        
-        t = Table(software_list, colWidths=[2*inch, 3*inch, 1.5*inch])
-        t.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(COLORS['primary'])),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 14),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('TOPPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor(COLORS['light'])),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.HexColor(COLORS['text'])),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor(COLORS['primary'])),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor(COLORS['highlight'])]),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-            ('TOPPADDING', (0, 1), (-1, -1), 8),
-            ('LEFTPADDING', (0, 0), (-1, -1), 8),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 8)
-        ]))
-        
-        story.append(t)
-        story.append(Spacer(1, 1*inch))
-        story.append(Paragraph("<hr width='100%' color='#60a5fa'/>", styles['CustomBody']))
-
-        # --- PROJECT STRUCTURE ---
-        story.append(Paragraph("Project Structure", styles['SectionHeading']))
-        structure_list = [
-            ["Directory", "Purpose"],
-            ["scripts/", "Python scripts for structure generation and analysis"],
-            ["inputs/", "LAMMPS input files and potential files"],
-            ["outputs/", "Raw simulation outputs and initial data"],
-            ["results/", "Final analysis outputs and visualizations"],
-            ["studies/", "Supplementary analysis files"],
-            ["bin/", "Executable files (e.g., Atomsk)"]
-        ]
-        t = Table(structure_list, colWidths=[2*inch, 4.5*inch])
-        t.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(COLORS['primary'])),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 13),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 14),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor(COLORS['light'])),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.HexColor(COLORS['text'])),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor(COLORS['primary'])),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor(COLORS['light'])])
-        ]))
-        story.append(t)
-        story.append(Spacer(1, 12))
-        story.append(Paragraph("<hr width='100%' color='#60a5fa'/>", styles['CustomBody']))
+        # --- TABLE OF CONTENTS, OVERVIEW, SOFTWARE AND STRUCTURE ---
+        story.extend(_fixed_sections())
 
         # --- RESULTS AND VISUALIZATIONS ---
         story.append(PageBreak())
-        story.append(Paragraph("Results and Visualizations", styles['SectionHeading']))
+        story.append(_section_heading("Results and Visualizations"))
         image_files = [
             ("Stress-Strain Curve", "results/stress_strain_curve.png", 
              "The stress-strain curve shows the material's response to applied deformation, including elastic and plastic regions."),
@@ -421,14 +539,17 @@ def create_project_report():
             ("CSP Distribution", "results/csp_distribution.png",
              "Distribution of Centro-Symmetry Parameter (CSP) values indicating defect regions.")
         ]
+        # One directory read instead of a stat per image (all figures live in results/)
+        with os.scandir("results") as entries:
+            existing = {entry.name for entry in entries}
         for caption, img_path, description in image_files:
-            if os.path.exists(img_path):
+            if os.path.basename(img_path) in existing:
                 story.append(Spacer(1, 18))
                 story.append(Image(img_path, width=6*inch, height=4*inch))
                 story.append(Paragraph(f"<b>{caption}</b>", styles['ImageCaption']))
                 story.append(Paragraph(description, styles['CustomBody']))
         story.append(Spacer(1, 12))
-        story.append(Paragraph("<hr width='100%' color='#60a5fa'/>", styles['CustomBody']))
+        story.append(_body_paragraph("<hr width='100%' color='#60a5fa'/>"))
 
         # --- STUDIES AND RESULTS (MARKDOWN) ---
         md_files = [
@@ -438,23 +559,8 @@ def create_project_report():
         ]
         for section_title, md_path in md_files:
             story.append(PageBreak())
-            story.append(Paragraph(section_title, styles['SectionHeading']))
-            md_content = read_markdown_file(md_path)
-            if isinstance(md_content, list):
-                for item in md_content:
-                    if isinstance(item, Table):
-                        story.append(item)
-                        story.append(Spacer(1, 18))
-                    else:
-                        for para in item.split('\n\n'):
-                            if para.strip():
-                                story.append(Paragraph(para.replace('\n', '<br/>'), styles['CustomBody']))
-                                story.append(Spacer(1, 8))
-            else:
-                for para in md_content.split('\n\n'):
-                    if para.strip():
-                        story.append(Paragraph(para.replace('\n', '<br/>'), styles['CustomBody']))
-                        story.append(Spacer(1, 8))
+            story.append(_section_heading(section_title))
+            story.extend(iter_markdown_flowables(md_path, styles))
             story.append(Spacer(1, 16))
 
         print("Building PDF...")
@@ -2,9 +2,16 @@ import numpy as np
 import subprocess
 import os
 
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional; the rejection sampler then runs in plain NumPy
+    HAVE_NUMBA = False
+
 # Parameters
 box_size = 100.0  # Angstrom
 num_grains = 10
+min_grain_distance = 0.0  # Angstrom; minimum spacing between grain centers (0 disables the check)
 # Construct the absolute path to atomsk.exe
 # Assuming atomsk.exe is in the bin directory at the project root
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -17,47 +24,101 @@ seed_file = os.path.join(project_root, 'inputs', 'fcc_Al_unitcell.lmp')
 
 # --- Create a placeholder seed file in LAMMPS data format ---
 # A simple FCC Al unit cell (create in inputs directory if it doesn't exist)
-seed_file_path_inputs = os.path.join(project_root, 'inputs', 'fcc_Al_unitcell.lmp')
-if not os.path.exists(seed_file_path_inputs):
-    print(f"Creating a placeholder seed file: {seed_file_path_inputs}")
+_SEED_TEMPLATE = """LAMMPS data file via Atomsk
+
+1 atoms
+1 atom types
+
+0.0 4.05 xlo xhi
+0.0 4.05 ylo yhi
+0.0 4.05 zlo zhi
+
+Masses
+
+1 26.981540
+
+Atoms # atomic
+
+1 1 0.0 0.0 0.0
+"""
+if not os.path.exists(seed_file):
+    print(f"Creating a placeholder seed file: {seed_file}")
     # Ensure the inputs directory exists before creating the file
-    os.makedirs(os.path.join(project_root, 'inputs'), exist_ok=True)
-    with open(seed_file_path_inputs, 'w') as f:
-        f.write("LAMMPS data file via Atomsk\n\n")
-        f.write("1 atoms\n")
-        f.write("1 atom types\n\n")
-        f.write("0.0 4.05 xlo xhi\n")
-        f.write("0.0 4.05 ylo yhi\n")
-        f.write("0.0 4.05 zlo zhi\n")
-        f.write("0.0 4.05 ylo yhi\n") # Corrected ylo/yhi line
-        f.write("0.0 4.05 zlo zhi\n") # Corrected zlo/zhi line
-        f.write("\nMasses\n\n") # Added Masses section
-        f.write("1 26.981540\n") # Added Al mass
-        f.write("\nAtoms # atomic\n\n")
-        f.write("1 1 0.0 0.0 0.0\n") # Atom ID, atom type, x, y, z
+    os.makedirs(os.path.dirname(seed_file), exist_ok=True)
+    with open(seed_file, 'w') as f:
+        f.write(_SEED_TEMPLATE)
 # ---------------------------------------------------------
 
-# Generate random grain centers
-np.random.seed(42)
+# Give up after this many candidates per grain (min_grain_distance too large for the box)
+MAX_ATTEMPTS_PER_GRAIN = 10000
+
+if HAVE_NUMBA:
+    @njit(cache=True)
+    def _sample_centers(n, box, min_dist, seed):
+        """Rejection-sample n centers in [0, box)^3 that are at least min_dist apart."""
+        np.random.seed(seed)
+        centers = np.empty((n, 3))
+        min_dist_sq = min_dist * min_dist
+        count = 0
+        attempts = 0
+        while count < n:
+            attempts += 1
+            if attempts > MAX_ATTEMPTS_PER_GRAIN * n:
+                raise ValueError("could not place grain centers; reduce min_grain_distance")
+            x = np.random.uniform(0.0, box)
+            y = np.random.uniform(0.0, box)
+            z = np.random.uniform(0.0, box)
+            accept = True
+            for j in range(count):
+                dx = centers[j, 0] - x
+                dy = centers[j, 1] - y
+                dz = centers[j, 2] - z
+                if dx * dx + dy * dy + dz * dz < min_dist_sq:
+                    accept = False
+                    break
+            if accept:
+                centers[count, 0] = x
+                centers[count, 1] = y
+                centers[count, 2] = z
+                count += 1
+        return centers
+else:
+    def _sample_centers(n, box, min_dist, seed):
+        """Rejection-sample n centers in [0, box)^3 that are at least min_dist apart."""
+        rng = np.random.RandomState(seed)
+        centers = np.empty((n, 3))
+        min_dist_sq = min_dist * min_dist
+        count = 0
+        attempts = 0
+        while count < n:
+            attempts += 1
+            if attempts > MAX_ATTEMPTS_PER_GRAIN * n:
+                raise ValueError("could not place grain centers; reduce min_grain_distance")
+            candidate = rng.uniform(0.0, box, size=3)
+            if np.all(np.sum((centers[:count] - candidate) ** 2, axis=1) >= min_dist_sq):
+                centers[count] = candidate
+                count += 1
+        return centers
+
+# One local Generator drives all random draws (the global RandomState is left untouched)
+rng = np.random.default_rng(42)
 # Generate centers within the box size
-grain_centers = np.random.uniform(0, box_size, size=(num_grains, 3))
+if min_grain_distance > 0:
+    # The rejection sampler runs its own (compiled) stream, seeded from rng
+    grain_centers = _sample_centers(num_grains, box_size, min_grain_distance, int(rng.integers(2**32)))
+else:
+    grain_centers = rng.uniform(0, box_size, size=(num_grains, 3))
 
-# Generate unique orientations for each grain (as Euler angles in degrees)
-orientations = []
-for i in range(num_grains):
-    # Random Euler angles (phi1, Phi, phi2)
-    phi1, Phi, phi2 = np.random.uniform(0, 360, 3)
-    orientations.append((phi1, Phi, phi2))
+# Generate unique orientations for each grain (as Euler angles phi1, Phi, phi2 in degrees)
+orientations = rng.uniform(0, 360, size=(num_grains, 3))
 
 # Write Atomsk parameter file (output to inputs directory)
 param_file_name = f'{output_prefix}.txt'
 param_file_path = os.path.join(project_root, 'inputs', param_file_name)
-with open(param_file_path, 'w') as f:
-    f.write(f"box {box_size:.2f} {box_size:.2f} {box_size:.2f}\n")
-    for i in range(num_grains):
-        center = grain_centers[i]
-        orientation = orientations[i]
-        f.write(f"node {center[0]:.3f} {center[1]:.3f} {center[2]:.3f} {orientation[0]:.2f} {orientation[1]:.2f} {orientation[2]:.2f}\n")
+# One node line per grain: center (x, y, z) followed by its Euler angles
+np.savetxt(param_file_path, np.hstack([grain_centers, orientations]),
+           fmt='node %.3f %.3f %.3f %.2f %.2f %.2f',
+           header=f"box {box_size:.2f} {box_size:.2f} {box_size:.2f}", comments='')
 
 # Output LAMMPS file path (output to inputs directory)
 output_lmp_file = os.path.join(project_root, 'inputs', f'{output_prefix}.lmp')
@@ -66,7 +127,7 @@ output_lmp_file = os.path.join(project_root, 'inputs', f'{output_prefix}.lmp')
 atomsk_command = [
     atomsk_path,
     '--polycrystal',
-    seed_file_path_inputs, # Seed file from inputs directory
+    seed_file, # Seed file from inputs directory
     param_file_path, # Parameter file from inputs directory
     output_lmp_file, # Output LAMMPS file to inputs directory
     '-wrap',        # Wrap atoms back into the box
@@ -74,8 +135,9 @@ atomsk_command = [
 ]
 
 print(f"Running Atomsk command: {' '.join(atomsk_command)}")
-# Use shell=True for easier path handling on Windows, and check=True to raise an error if the command fails
-result = subprocess.run(atomsk_command, shell=True, check=True, capture_output=True, text=True)
+# Run Atomsk directly (no intermediate shell; subprocess quotes each argument itself),
+# and check=True to raise an error if the command fails
+result = subprocess.run(atomsk_command, check=True, capture_output=True, text=True)
 
 print("Atomsk stdout:")
 print(result.stdout)
@@ -0,0 +1,74 @@
+import numpy as np
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional; callers fall back to their own NumPy parsers
+    HAVE_NUMBA = False
+
+# Lower-case spellings of the non-finite values LAMMPS may print
+_NAN = np.frombuffer(b'nan', dtype=np.uint8)
+_INF = np.frombuffer(b'inf', dtype=np.uint8)
+_INFINITY = np.frombuffer(b'infinity', dtype=np.uint8)
+
+if HAVE_NUMBA:
+    @njit(cache=True)
+    def _is_word(buf, s, e, word):
+        """Return True if buf[s:e] spells word (lower-case bytes), ignoring ASCII case."""
+        if e - s != word.size:
+            return False
+        for k in range(word.size):
+            if buf[s + k] | 32 != word[k]:
+                return False
+        return True
+
+    @njit(cache=True)
+    def parse_token(buf, s, e):
+        """Parse the ASCII number in buf[s:e] (including nan/inf); raise ValueError if it is not one."""
+        i = s
+        sign = 1.0
+        if i < e and buf[i] == 45:  # '-'
+            sign = -1.0
+            i += 1
+        elif i < e and buf[i] == 43:  # '+'
+            i += 1
+        # nan, inf and infinity are accepted in any case, as float() and np.loadtxt do
+        if _is_word(buf, i, e, _NAN):
+            return np.nan
+        if _is_word(buf, i, e, _INF) or _is_word(buf, i, e, _INFINITY):
+            return sign * np.inf
+        mantissa = 0.0
+        scale = 0
+        n_digits = 0
+        while i < e and 48 <= buf[i] <= 57:
+            mantissa = mantissa * 10.0 + (buf[i] - 48)
+            n_digits += 1
+            i += 1
+        if i < e and buf[i] == 46:  # '.'
+            i += 1
+            while i < e and 48 <= buf[i] <= 57:
+                mantissa = mantissa * 10.0 + (buf[i] - 48)
+                n_digits += 1
+                scale -= 1
+                i += 1
+        if n_digits > 0 and i < e and (buf[i] == 101 or buf[i] == 69):  # 'e' / 'E'
+            i += 1
+            exp_sign = 1
+            if i < e and buf[i] == 45:
+                exp_sign = -1
+                i += 1
+            elif i < e and buf[i] == 43:
+                i += 1
+            exponent = 0
+            exp_start = i
+            while i < e and 48 <= buf[i] <= 57:
+                exponent = exponent * 10 + (buf[i] - 48)
+                i += 1
+            if i == exp_start:  # an exponent needs at least one digit
+                n_digits = 0
+            scale += exp_sign * exponent
+        if n_digits == 0 or i != e:
+            raise ValueError("could not convert a LAMMPS value to float")
+        if scale < 0:
+            return sign * (mantissa / 10.0 ** (-scale))
+        return sign * (mantissa * 10.0 ** scale)
@@ -1,33 +1,70 @@
 from ovito.io import import_file
 from ovito.modifiers import *
 import sys
+import mmap
+import re
 
-def load_full_trajectory(filename):
-    """Loads the full trajectory in OVITO with all timesteps."""
+# Every frame of a LAMMPS dump starts with this header line
+FRAME_MARKER_RE = re.compile(rb'^ITEM: TIMESTEP', re.MULTILINE)
+
+def _count_frames_lammps_dump(path):
+    """Count the frames of a LAMMPS dump with one sequential scan for frame headers.
+
+    Only LAMMPS text dumps are recognised (they start with 'ITEM: TIMESTEP'); for any
+    other file None is returned.
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(b'ITEM: TIMESTEP')) != b'ITEM: TIMESTEP':
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return sum(1 for _ in FRAME_MARKER_RE.finditer(mm))
+
+def load_full_trajectory(filename, compute_frames=()):
+    """Loads the full trajectory in OVITO with all timesteps.
+
+    Only the frames listed in compute_frames are evaluated (with DXA); returns the
+    pipeline and the number of frames. For a LAMMPS dump with no frames requested
+    OVITO is never invoked and the pipeline is None.
+    """
     try:
-        # Load the simulation file with all frames
-        pipeline = import_file(filename, multiple_frames=True)
+        # Count frames with a byte scan instead of letting OVITO index the whole file
+        num_frames = _count_frames_lammps_dump(filename)
         
-        # Get the number of frames
-        num_frames = pipeline.source.num_frames
-        print(f"Total number of frames loaded: {num_frames}")
+        pipeline = None
+        compute_frames = list(compute_frames)
+        if compute_frames or num_frames is None:
+            # Load the simulation file with all frames
+            pipeline = import_file(filename, multiple_frames=True)
+            
+            # Formats other than LAMMPS dumps fall back to OVITO's own count
+            if num_frames is None:
+                num_frames = pipeline.source.num_frames
+        print(f"Total number of frames found: {num_frames}")
         
-        # Apply any necessary modifiers
-        # For example, you might want to add DXA for dislocation analysis
-        pipeline.modifiers.append(DislocationAnalysisModifier())
+        if compute_frames:
+            # Apply any necessary modifiers
+            # DXA is expensive, so it is only added when frames are actually evaluated
+            pipeline.modifiers.append(DislocationAnalysisModifier())
+            
+            # Compute the requested frames on demand
+            for frame in compute_frames:
+                pipeline.compute(frame)
         
-        # Compute the first frame to ensure everything is loaded
-        pipeline.compute(0)
+        if pipeline is None:
+            print("No frames requested; pass compute_frames to load them in OVITO.")
+            return pipeline, num_frames
         
         print("Successfully loaded all frames!")
         print("You can now use OVITO's interface to analyze the full trajectory.")
         print("Use the timeline slider to navigate through all timesteps.")
+        return pipeline, num_frames
         
     except Exception as e:
         print(f"An error occurred: {e}")
         print("Please ensure OVITO Python API is installed (`pip install ovito`) and the file path is correct.")
+        raise
 
 if __name__ == "__main__":
     # Specify the input file
     input_file = "../outputs/dump.voro"
-    load_full_trajectory(input_file) 
\ No newline at end of file
+    load_full_trajectory(input_file)
@@ -1,74 +1,157 @@
 import numpy as np
 import matplotlib.pyplot as plt
 import re
-
-# Read the data from lammps.log
-timesteps = []
-stresses = []  # Pzz values
-strains = []   # Calculated from Lz
-
-with open('lammps.log', 'r') as f:
-    lines = f.readlines()
+import os
+import mmap
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional; thermo rows are matched with a regex instead
+    HAVE_NUMBA = True
+
+# Thermo header of the tensile run; compiled once instead of on every scanned line
+_HEADER_RE = re.compile(rb'Step.*Temp.*PotEng.*KinEng.*TotEng.*Press.*Pxx.*Pyy.*Pzz.*Pxy.*Pxz.*Pyz.*Lx.*Ly.*Lz')
+
+# Upper bound on the points drawn for the curve; long runs are strided down to about this many
+MAX_PLOT_POINTS = 5000
+
+# Record layout of the captured thermo columns
+_THERMO_DTYPE = np.dtype([('step', 'i8'), ('pzz', 'f8'), ('lz', 'f8')])
+
+if HAVE_NUMBA:
+    from lammps_tokens import parse_token
+
+    @njit(cache=True)
+    def _parse_thermo(buf, start, n_fields, step_col, pzz_col, lz_col):
+        """Scan a log buffer from start in one pass; return (steps, pzz, lz) of the finite thermo rows.
+
+        A thermo row has exactly n_fields fields and an all-digit first field, the same rule as the
+        row regex used without numba.
+        """
+        size = buf.size
+        # Every row is a line, so the line count bounds the outputs
+        n_lines = 1
+        for i in range(start, size):
+            if buf[i] == 10:  # '\n'
+                n_lines += 1
+        steps = np.empty(n_lines, dtype=np.int64)
+        pzz = np.empty(n_lines)
+        lz = np.empty(n_lines)
+        row = 0
+        i = start
+        while i < size:
+            eol = i
+            while eol < size and buf[eol] != 10:
+                eol += 1
+            # Split the line into fields, remembering where the three wanted ones are
+            col = 0
+            is_row = True
+            step_s = step_e = pzz_s = pzz_e = lz_s = lz_e = 0
+            j = i
+            while j < eol and is_row:
+                c = buf[j]
+                if c == 32 or c == 9 or c == 13:  # whitespace, including '\r'
+                    j += 1
+                    continue
+                s = j
+                while j < eol and buf[j] != 32 and buf[j] != 9 and buf[j] != 13:
+                    if col == 0 and not 48 <= buf[j] <= 57:
+                        is_row = False
+                    j += 1
+                if col == step_col:
+                    step_s, step_e = s, j
+                if col == pzz_col:
+                    pzz_s, pzz_e = s, j
+                if col == lz_col:
+                    lz_s, lz_e = s, j
+                col += 1
+            if is_row and col == n_fields:
+                step = 0
+                for k in range(step_s, step_e):
+                    if not 48 <= buf[k] <= 57:
+                        raise ValueError("could not convert a thermo step to int")
+                    step = step * 10 + (buf[k] - 48)
+                p = parse_token(buf, pzz_s, pzz_e)
+                z = parse_token(buf, lz_s, lz_e)
+                # Rows LAMMPS printed as nan/inf (e.g. a blown-up run) are dropped here
+                if np.isfinite(p) and np.isfinite(z):
+                    steps[row] = step
+                    pzz[row] = p
+                    lz[row] = z
+                    row += 1
+            i = eol + 1
+        return steps[:row], pzz[:row], lz[:row]
+
+# Read the data from lammps.log through a read-only memory map: the OS pages it in on demand
+# instead of copying it into the Python heap (an empty log cannot be mapped and has no header)
+with open('lammps.log', 'rb') as f:
+    log = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b''
 
 # Use regex to find the header line and extract column indices dynamically
 header_line = None
 header_parts = []
-for i, line in enumerate(lines):
-    if 'Step' in line and 'Temp' in line and 'Press' in line:
-        # Use regex to handle variable spacing
-        match = re.search(r'(Step.*Temp.*PotEng.*KinEng.*TotEng.*Press.*Pxx.*Pyy.*Pzz.*Pxy.*Pxz.*Pyz.*Lx.*Ly.*Lz)', line)
-        if match:
-            header_line = line
-            # Split based on whitespace and filter out empty strings
-            header_parts = [part for part in header_line.split() if part]
-            start_idx = i + 1
-            break
+body_start = 0
+match = _HEADER_RE.search(log)
+if match:
+    line_start = log.rfind(b'\n', 0, match.start()) + 1
+    body_start = log.find(b'\n', match.end())
+    if body_start < 0:
+        body_start = len(log)
+    header_line = log[line_start:body_start].decode()
+    # Split based on whitespace and filter out empty strings
+    header_parts = [part for part in header_line.split() if part]
 
 if header_line is None:
     print("Error: Could not find the header line in lammps.log")
 else:
     try:
-        # Find column indices based on header parts
-        step_col = header_parts.index('Step')
-        pzz_col = header_parts.index('Pzz')
-        lz_col = header_parts.index('Lz')
-
-        # Assume initial Lz from the first data line after header
-        initial_Lz = None
-
-        # Read the data from all thermo blocks
-        for line in lines[start_idx:]:
-            if line.strip() and not line.startswith('Loop') and not line.startswith('elapsed') and not line.startswith('Total') and not line.startswith('cpu') and not line.startswith('MPI') and not line.startswith('Section') and not line.startswith('Neigh') and not line.startswith('Histogram') and not line.startswith('Nlocal') and not line.startswith('Nghost') and not line.startswith('Neighs') and not line.startswith('FullNghs'):
-                 # Split based on whitespace and filter out empty strings
-                parts = [part for part in line.split() if part]
-
-                if len(parts) > max(step_col, pzz_col, lz_col):
-                    current_timestep = int(parts[step_col])
-                    current_pzz = float(parts[pzz_col])
-                    current_Lz = float(parts[lz_col])
-
-                    if initial_Lz is None and current_timestep == 0:
-                        initial_Lz = current_Lz
-
-                    if initial_Lz is not None:
-                        strain = (current_Lz - initial_Lz) / initial_Lz
-
-                        timesteps.append(current_timestep)
-                        stresses.append(current_pzz)
-                        strains.append(strain)
-
-
-        if not timesteps:
+        # Find column indices based on header parts (one dict built from the header)
+        col = {name: i for i, name in enumerate(header_parts)}
+        step_col = col['Step']
+        pzz_col = col['Pzz']
+        lz_col = col['Lz']
+
+        if HAVE_NUMBA:
+            # Compiled single pass over the mapped bytes: row matching, parsing and the finite filter
+            step_arr, pzz_arr, Lz_arr = _parse_thermo(np.frombuffer(log, dtype=np.uint8), body_start,
+                                                      len(header_parts), step_col, pzz_col, lz_col)
+        else:
+            # One multiline regex over the whole thermo section: a row has exactly one field per header
+            # column and starts with an integer step, so summary and warning lines never match.
+            # Only Step, Pzz and Lz are captured (in that order, as in the header).
+            fields = [rb'\S+'] * len(header_parts)
+            fields[0] = rb'\d+'
+            for c in (step_col, pzz_col, lz_col):
+                fields[c] = b'(' + fields[c] + b')'
+            row_re = re.compile(rb'^[ \t]*' + rb'[ \t]+'.join(fields) + rb'[ \t\r]*$', re.MULTILINE)
+
+            # Convert the captured (ASCII) tokens straight into a structured array, as np.fromregex
+            # does, but over the mapped thermo section instead of a second full read of the file
+            data = np.array(row_re.findall(log, body_start), dtype=_THERMO_DTYPE)
+            # Drop rows LAMMPS printed as nan/inf (e.g. a blown-up run) with one vectorized validity mask
+            data = data[np.isfinite(data['pzz']) & np.isfinite(data['lz'])]
+            step_arr = data['step']
+            pzz_arr = data['pzz']
+            Lz_arr = data['lz']
+
+        # Strain is measured against Lz of the first step-0 row, or of the first row when the log
+        # has no step 0 (e.g. a restarted run); rows before it have no reference
+        idx0 = np.flatnonzero(step_arr == 0)
+        first = idx0[0] if idx0.size else 0
+        timesteps = step_arr[first:]
+        stresses = pzz_arr[first:]  # Pzz values
+        Lz_run = Lz_arr[first:]
+        initial_Lz = Lz_run[:1]  # empty when there are no rows, so the expression below stays valid
+        strains = (Lz_run - initial_Lz) / initial_Lz
+
+        if timesteps.size == 0:
             print("Error: No data points found after header.")
         else:
-            # Convert to numpy arrays
-            timesteps = np.array(timesteps)
-            stresses = np.array(stresses)
-            strains = np.array(strains)
-
-            # Create the plot
+            # Create the plot (strided for long runs; the yield point below uses the full arrays)
+            plot_stride = max(1, len(strains) // MAX_PLOT_POINTS)
             plt.figure(figsize=(10, 6))
-            plt.plot(strains, stresses, 'b-', linewidth=2)
+            plt.plot(strains[::plot_stride], stresses[::plot_stride], 'b-', linewidth=2)
 
             # Add labels and title
             plt.xlabel('Engineering Strain', fontsize=12)
@@ -78,10 +161,11 @@ else:
             # Add grid
             plt.grid(True, linestyle='--', alpha=0.7)
 
+            # Find index of maximum stress as potential yield point (also reused for the summary below)
+            yield_point_idx = np.argmax(stresses)
+
             # Find and annotate yield point (approximate - usually the peak stress before significant drop)
             if len(stresses) > 1:
-                # Find index of maximum stress as potential yield point
-                yield_point_idx = np.argmax(stresses)
                 # Check if maximum stress is not at the very beginning (timestep 0)
                 if timesteps[yield_point_idx] > 0:
                      plt.plot(strains[yield_point_idx], stresses[yield_point_idx], 'ro', label='Approx. Yield Point')
@@ -101,18 +185,19 @@ else:
             plt.savefig('stress_strain_curve.png', dpi=300, bbox_inches='tight')
             plt.close()
 
-            # Print some key values
-            print(f"Maximum stress: {np.max(stresses):.2f} eV/Å³")
-            print(f"Maximum strain: {np.max(strains):.4f}")
+            # Print some key values (each strain extreme is reduced once and reused)
+            min_strain, max_strain = strains.min(), strains.max()
+            print(f"Maximum stress: {stresses[yield_point_idx]:.2f} eV/Å³")
+            print(f"Maximum strain: {max_strain:.4f}")
             if len(stresses) > 1 and timesteps[yield_point_idx] > 0:
                  print(f"Approx. Yield stress: {stresses[yield_point_idx]:.2f} eV/Å³")
                  print(f"Approx. Yield strain: {strains[yield_point_idx]:.4f}")
 
             # Print strain range
-            print(f"\nStrain range: {np.min(strains):.4f} to {np.max(strains):.4f}")
+            print(f"\nStrain range: {min_strain:.4f} to {max_strain:.4f}")
             print(f"Number of data points: {len(strains)}")
 
-    except ValueError as e:
+    except (KeyError, ValueError) as e:
         print(f"Error processing log file: {e}. Please ensure the column names (Step, Pzz, Lz) are present and correctly spelled in your log file.")
     except Exception as e:
         print(f"An unexpected error occurred: {e}") 
\ No newline at end of file